@@ -1,171 +1,291 @@
 import sys
 import os
-import tempfile
+import stat
+import io
 import re
+import glob
 from pathlib import Path
 import concurrent.futures
+import functools
+import json
+import shutil
+import hashlib
 
 # This script is part of a two-pass build system.
 # 1. LaTeX runs first, creating a .scores.aux file with a list of required scores.
 # 2. This script reads that .scores.aux file and renders the scores.
 # 3. LaTeX runs again to include the newly created score files.
 
-# Import rendering libraries
-import verovio
-import cairosvg
-from PyPDF2 import PdfMerger
 import subprocess
 
-# auxiliary function needed to render string value in pt from latex from aux file to int pixel for Verovio.
-def parse_latex_dimension(dim_str: str) -> int:
-    
-    # match string in pt -> to float in pt
-    match = re.match(r"([0-9.]+)", dim_str)
-    
-    # string in pt -> to float in pt
-    dimension_in_pt = float(match.group(1))
-
-    # float in pt -> to float in mm
-    dimension_in_mm = dimension_in_pt * 0.3527
-    
-    # get float in mm -> to int in pixels
-    dimension_in_pixels = int(dimension_in_mm * 10) 
-    
-    if dimension_in_pixels:
-        return dimension_in_pixels
-    return 0.0 # Default or error value
-
-def convert_svg_to_pdf(svg: str, pdf_path: Path):
-    """Helper function to convert SVG string to PDF file."""
-    cairosvg.svg2pdf(bytestring=svg.encode('utf-8'), write_to=str(pdf_path))
+# Rendering libraries are slow to import, they are only loaded by _import_renderers
+# once there is something to render, so usage errors and a missing aux file exit fast.
+verovio = None
+cairosvg = None
+PdfReader = None
+PdfWriter = None
+
+def _import_renderers():
+    """Imports the rendering libraries into the module namespace."""
+    global verovio, cairosvg, PdfReader, PdfWriter
+    import verovio
+    import cairosvg
+    from pypdf import PdfReader, PdfWriter
+
+# Verovio toolkit reused across all scores rendered by this (worker) process,
+# so fonts and internal data are only loaded once.
+_TK = None
+
+def _get_toolkit():
+    """Returns the process wide Verovio toolkit, creating it on first use."""
+    global _TK
+    if _TK is None:
+        _TK = verovio.toolkit()
+    return _TK
+
+def _init_worker():
+    """Pool initializer that warms up the Verovio toolkit in each worker."""
+    _import_renderers()
+    _get_toolkit()
+
+# One .scores.aux request line: ID|TYPE|PATH|FONT|UNIT, ID being the numeric LaTeX score counter,
+# followed by six LaTeX dimensions in pt (paperwidth, paperheight, top, bottom, oddside, evenside margins)
+_LINE_RE = re.compile(
+    r"^([0-9]+)\|([^|]*)\|([^|]*)\|([^|]*)\|([^|]*)"
+    r"\|([0-9]*\.?[0-9]+)[^|]*\|([0-9]*\.?[0-9]+)[^|]*\|([0-9]*\.?[0-9]+)[^|]*"
+    r"\|([0-9]*\.?[0-9]+)[^|]*\|([0-9]*\.?[0-9]+)[^|]*\|([0-9]*\.?[0-9]+)[^|]*$"
+)
+
+# pt -> mm (0.3527) -> Verovio pixels (10 per mm)
+_PT_TO_PX = 3.527
+
+# Verovio options shared by every score type
+_BASE_OPTS = {
+    # "scaleToPageSize": True,
+    # "scale": 100, # Default scale
+    "mmOutput": True, # Output dimensions in mm for PDF readiness
+    "footer": "none",
+}
+
+def convert_svg_to_pdf(svg: bytes) -> io.BytesIO:
+    """Helper function to convert encoded SVG to an in-memory PDF."""
+    buf = io.BytesIO()
+    cairosvg.svg2pdf(bytestring=svg, write_to=buf)
+    buf.seek(0)
+    return buf
 
 def convert_page_to_pdf(args):
-    i, svg, tmpdir = args
-    pdf_page = Path(tmpdir) / f"p{i}.pdf"
+    i, svg = args
     try:
-        convert_svg_to_pdf(svg, pdf_page)
-        return (i, str(pdf_page))
+        return (i, convert_svg_to_pdf(svg))
     except Exception as e:
         print(f"  -> Error converting page {i} to PDF: {e}")
         return (i, None)
 
-def render_score(input_file: Path, output_pdf: Path, verovio_options: dict):
+def render_score(input_file: Path, output_pdf: Path, verovio_options: dict, converted: dict):
     """Renders a single file to a PDF using a specific set of Verovio options."""
+    _import_renderers()
 
-    # No file exit
-    if not input_file.is_file():
-        print(f"  -> Error: file not found at {input_file}")
-        return 0
-
-    # Check if input_file is a .mscz file and convert to .mxl using MuseScore
-    temp_mxl = None
+    # .mscz files are converted to .mxl up front in a single MuseScore batch job
     if input_file.suffix == '.mscz':
-        try:
-            temp_mxl = tempfile.NamedTemporaryFile(delete=False, suffix=".mxl")
-            temp_mxl.close()
-            result = subprocess.run(["mscore", str(input_file), "-o", temp_mxl.name], capture_output=True, text=True)
-            if result.returncode != 0 or not Path(temp_mxl.name).is_file():
-                print(f"  -> Error: Failed to convert {input_file} to mxl. MuseScore output:\n{result.stderr}")
-                return 0
-            input_file = Path(temp_mxl.name)
-        except Exception as e:
-            print(f"  -> Error: Exception during conversion of {input_file} to mxl: {e}")
+        if input_file not in converted:
+            print(f"  -> Error: No converted mxl available for {input_file}")
             return 0
+        input_file = converted[input_file]
 
     # Loading the options and file
     try:
-        tk = verovio.toolkit()
+        tk = _get_toolkit()
+        tk.resetOptions()
         tk.setOptions(verovio_options)
         tk.loadFile(str(input_file))
         page_count = tk.getPageCount()
     except Exception as e: # verovio error exit
         print(f"  -> Error processing {input_file.name}: {e}")
         return 0
-    finally:
-        if temp_mxl is not None:
-            try:
-                os.unlink(temp_mxl.name)
-            except Exception:
-                pass
 
     # file but no output exit
     if page_count == 0:
         return 0
 
-    # convert svg to pdf pages in parallel to speed up cairoSVG conversion
-    with tempfile.TemporaryDirectory() as tmpdir:
-        svg_pages = []
-        for i in range(1, page_count + 1):
-            try:
-                svg = tk.renderToSVG(i)
-                svg_pages.append((i, svg))
-            except Exception as e:
-                print(f"  -> Error rendering page {i} of {input_file.name} to SVG: {e}")
-                return 0
-
-        # Prepare arguments for parallel conversion
-        convert_args = [(i, svg, tmpdir) for i, svg in svg_pages]
-
-        pages = []
-        with concurrent.futures.ProcessPoolExecutor() as executor:
-            results = executor.map(convert_page_to_pdf, convert_args)
-            for i, pdf_path in results:
-                if pdf_path is None:
-                    return 0
-                pages.append((i, pdf_path))
-
-        # Sort pages by page number to ensure correct order before merging
-        pages.sort(key=lambda x: x[0])
-
-        # Merge Pages to single pdf write to output_pdf path
-        merger = PdfMerger()
-        for _, p in pages:
-            merger.append(p)
-        merger.write(str(output_pdf))
-        merger.close()
-    
+    # convert svg to pdf pages one by one. render_score runs inside the score worker
+    # processes, which already use every core, so pages are converted inline.
+    # Verovio only returns str SVG, each page is encoded once and converted right
+    # away, so only one page's SVG is held at a time. Pages are kept in memory,
+    # no temporary files are written.
+    pages = []
+    for i in range(1, page_count + 1):
+        try:
+            svg = tk.renderToSVG(i).encode('utf-8')
+        except Exception as e:
+            print(f"  -> Error rendering page {i} of {input_file.name} to SVG: {e}")
+            return 0
+        i, pdf_buf = convert_page_to_pdf((i, svg))
+        if pdf_buf is None:
+            return 0
+        pages.append((i, pdf_buf))
+
+    # Merge Pages to single pdf write to output_pdf path
+    # each page is a standalone cairo PDF without outlines or forms, so its page
+    # objects are added directly instead of going through the full merge of append()
+    writer = PdfWriter()
+    for _, buf in pages:
+        for page in PdfReader(buf).pages:
+            writer.add_page(page)
+    # written to a temporary file and moved into place, so an interrupted build never
+    # leaves a truncated PDF, and a PDF hardlinked to another score is replaced, not overwritten
+    tmp_pdf = output_pdf.with_suffix(".pdf.tmp")
+    try:
+        with open(tmp_pdf, "wb") as f:
+            writer.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pdf, output_pdf)
+    except Exception:
+        tmp_pdf.unlink(missing_ok=True)
+        raise
+
     return page_count
 
-def process_request(request: str, project_root: Path, output_dir: Path):
-    request = request.strip()
-    if not request:
-        return None
+def convert_mscz_files(mscz_files: list, output_dir: Path) -> dict:
+    """Converts all .mscz files to .mxl in one MuseScore run, returns {mscz_path: mxl_path}.
+
+    Conversions are kept in output_dir, named after the .mscz path and modification time,
+    and reused by later builds as long as the .mscz file is unchanged."""
+
+    converted = {}
+    job = []
+    for mscz in mscz_files:
+        # the digest of the full path keeps apart sources sharing a stem (and maybe an mtime)
+        prefix = f"{mscz.stem}-{hashlib.blake2b(str(mscz.resolve()).encode()).hexdigest()[:8]}"
+        mxl = output_dir / f"{prefix}-{mscz.stat().st_mtime_ns:x}.mxl"
+        if mxl.is_file():
+            converted[mscz] = mxl
+        else:
+            # MuseScore picks the format from the extension, so the temporary name keeps .mxl
+            job.append({"in": str(mscz), "out": str(mxl.with_suffix(".tmp.mxl")), "mscz": mscz, "mxl": mxl, "prefix": prefix})
+
+    if not job:
+        return converted
+
+    # remove stale conversions of the sources about to be converted again
+    for entry in job:
+        stale_re = re.compile(re.escape(entry["prefix"]) + r"-[0-9a-f]+(\.tmp)?\.mxl")
+        for old_mxl in output_dir.glob(f"{glob.escape(entry['prefix'])}-*.mxl"):
+            if stale_re.fullmatch(old_mxl.name):
+                old_mxl.unlink()
+
+    print(f"--- Converting {len(job)} .mscz file(s) to mxl with MuseScore")
+    job_json = output_dir / "nota-mscz-job.json"
+    with open(job_json, 'w') as f:
+        json.dump([{"in": entry["in"], "out": entry["out"]} for entry in job], f)
 
     try:
-        parts = request.split('|', 10)
-        if len(parts) != 11:
-            print(f"  -> Warning: Malformed line in .scores.aux, skipping: {request}")
-            return None
-        score_id, score_type, file_path_str, font, unit, paperwidth_str, paperheight_str, topmargin_str, bottommargin_str, oddsidemargin_str, evensidemargin_str = parts
-    except ValueError:
-        print(f"  -> Warning: Malformed line in .scores.aux, skipping: {request}")
+        result = subprocess.run(["mscore", "-j", str(job_json)], capture_output=True, text=True)
+    except Exception as e:
+        print(f"  -> Error: Exception during MuseScore batch conversion: {e}")
+        return converted
+    finally:
+        job_json.unlink()
+
+    # moved into place only once complete, an interrupted run is never reused
+    for entry in job:
+        tmp_mxl = Path(entry["out"])
+        if tmp_mxl.is_file():
+            os.replace(tmp_mxl, entry["mxl"])
+            converted[entry["mscz"]] = entry["mxl"]
+        else:
+            print(f"  -> Error: Failed to convert {entry['mscz']} to mxl. MuseScore output:\n{result.stderr}")
+    return converted
+
+def render_key(input_file: Path, verovio_options: dict):
+    """Hash of the input file's path, mtime and size and the Verovio options, None if the input is missing."""
+    try:
+        st = input_file.stat()
+    except OSError:
         return None
+    h = hashlib.blake2b(json.dumps(verovio_options, sort_keys=True).encode())
+    h.update(str(input_file).encode())
+    h.update(str(st.st_mtime_ns).encode())
+    h.update(str(st.st_size).encode())
+    return h.hexdigest()[:16]
+
+def read_key_file(key_file: Path) -> tuple:
+    """Returns the (key, page_count) stored in a .pdf.key sidecar, (None, 0) if missing or invalid."""
+    try:
+        stored_key, page_count = key_file.read_text().split()
+        return stored_key, int(page_count)
+    except (OSError, ValueError):
+        return None, 0
+
+def request_unchanged(request: str, line_file: Path) -> bool:
+    """True if line_file holds the same request line."""
+    try:
+        return line_file.read_text() == request
+    except OSError:
+        return False
+
+def write_tex(output_tex: Path, output_pdf: Path, score_type: str, page_count: int):
+    """Writes the .tex include file for a rendered score."""
+    relative_pdf_path = os.path.relpath(output_pdf, output_tex.parent)
+
+    # examples are a single cropped graphic, all other types include every page
+    if score_type == 'example':
+        lines = [f"\\makebox[\\textwidth][c]{{\\includegraphics[scale=1]{{{relative_pdf_path}}}}}\n"]
+    else:
+        lines = [f"\\makebox[\\textwidth][c]{{\\includegraphics[page={i}, scale=1]{{{relative_pdf_path}}}}}\\par\n" for i in range(1, page_count + 1)]
+
+    # replaced atomically so LaTeX never reads a half written include file
+    tmp_tex = output_tex.with_suffix(".tex.tmp")
+    try:
+        with open(tmp_tex, 'w') as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_tex, output_tex)
+    except Exception:
+        tmp_tex.unlink(missing_ok=True)
+        raise
+
+def link_pdf(source_pdf: Path, target_pdf: Path):
+    """Hardlinks target_pdf to source_pdf, copying instead when linking is not possible."""
+    if target_pdf.exists() and os.path.samefile(source_pdf, target_pdf):
+        return
+    tmp_pdf = target_pdf.with_suffix(".pdf.tmp")
+    if tmp_pdf.exists():
+        tmp_pdf.unlink()
+    try:
+        try:
+            os.link(source_pdf, tmp_pdf)
+        except OSError:
+            shutil.copy(source_pdf, tmp_pdf)
+        os.replace(tmp_pdf, target_pdf)
+    except Exception:
+        tmp_pdf.unlink(missing_ok=True)
+        raise
+
+def parse_request(match: re.Match) -> tuple:
+    """Request fields from a _LINE_RE match, with the six LaTeX dimensions converted to Verovio pixels."""
+    return match.group(1, 2, 3, 4, 5) + tuple(int(float(match.group(i)) * _PT_TO_PX) for i in range(6, 12))
+
+def process_request(request: str, fields: tuple, duplicate_ids: list, project_root: Path, output_dir: Path, converted: dict):
+    """Renders one score request line, already validated and parsed into fields by main.
+
+    duplicate_ids are score IDs with an identical request, they reuse the same PDF.
+    Returns (score_id, tex_jobs) with the (score_id, score_type, page_count) of every
+    .tex include file to (re)write, or None if the score could not be rendered."""
+    score_id, score_type, file_path_str, font, unit, paperwidth_px, paperheight_px, topmargin_px, bottommargin_px, oddsidemargin_px, evensidemargin_px = fields
 
     print(f"- Processing score {score_id}: type '{score_type}', path '{file_path_str}'")
 
     input_file = project_root / file_path_str
 
-    # pixel values for Verovio
-    paperwidth_px = parse_latex_dimension(paperwidth_str)
-    paperheight_px = parse_latex_dimension(paperheight_str)
-    topmargin_px = parse_latex_dimension(topmargin_str)
-    bottommargin_px = parse_latex_dimension(bottommargin_str)
-    oddsidemargin_px = parse_latex_dimension(oddsidemargin_str)
-    evensidemargin_px = parse_latex_dimension(evensidemargin_str)
-
     # derive text width and height
     textwidth_px = paperwidth_px - oddsidemargin_px - evensidemargin_px
     textheight_px = paperheight_px - topmargin_px - bottommargin_px
 
     # Construct Verovio options dynamically
-    verovio_options = {
-        # "scaleToPageSize": True,
-        # "scale": 100, # Default scale
-        "mmOutput": True, # Output dimensions in mm for PDF readiness
-        "footer": "none",
-        "unit": unit,
-        "font" : font
-    }
+    verovio_options = {**_BASE_OPTS, "unit": unit, "font": font}
 
     # Set 'breaks' option based on score type
     
@@ -209,30 +329,63 @@ def process_request(request: str, project_root: Path, output_dir: Path):
     output_pdf = output_dir / f"nota-score-{score_id}.pdf"
     output_tex = output_dir / f"nota-score-{score_id}.tex"
 
-    page_count = render_score(input_file, output_pdf, verovio_options)
+    # Skip rendering when output_pdf is up to date: the input and options hash must
+    # match the stored key, and the stored request line must be unchanged as well.
+    key_file = output_pdf.with_suffix(".pdf.key")
+    line_file = output_pdf.with_suffix(".aux.line")
+    stored_key, page_count = read_key_file(key_file) if output_pdf.is_file() else (None, 0)
+    key = render_key(input_file, verovio_options)
+    if key is None or key != stored_key or not request_unchanged(request, line_file):
+        page_count = 0
 
+    tex_up_to_date = False
     if page_count > 0:
-        
-        print(f"  -> Rendered {output_pdf.name}")
-        
-        # Write the .tex include file
-        relative_pdf_path = os.path.relpath(output_pdf, output_dir)
-        
-        with open(output_tex, 'w') as f:
-            if score_type == 'fullscore':
-                for i in range(1, page_count + 1):
-                    f.write(f"\\makebox[\\textwidth][c]{{\\includegraphics[page={i}, scale=1]{{{relative_pdf_path}}}}}\\par\n")
-            elif score_type == 'inline':
-                for i in range(1, page_count + 1):
-                    f.write(f"\\makebox[\\textwidth][c]{{\\includegraphics[page={i}, scale=1]{{{relative_pdf_path}}}}}\\par\n")
-            elif score_type == 'example':
-                f.write(f"\\makebox[\\textwidth][c]{{\\includegraphics[scale=1]{{{relative_pdf_path}}}}}\n")
-            else:
-                for i in range(1, page_count + 1):
-                    f.write(f"\\makebox[\\textwidth][c]{{\\includegraphics[page={i}, scale=1]{{{relative_pdf_path}}}}}\\par\n")
-        print(f"  -> Created {output_tex.name}")
-        return score_id
-    return None
+        print(f"  -> Up to date {output_pdf.name}")
+        tex_up_to_date = output_tex.is_file() and output_tex.stat().st_mtime >= key_file.stat().st_mtime
+    else:
+        page_count = render_score(input_file, output_pdf, verovio_options, converted)
+        if page_count > 0:
+            print(f"  -> Rendered {output_pdf.name}")
+            if key is not None:
+                key_file.write_text(f"{key}\n{page_count}\n")
+                line_file.write_text(request)
+
+    if page_count == 0:
+        return None
+
+    # .tex include files are written by main, in score ID order
+    tex_jobs = [] if tex_up_to_date else [(score_id, score_type, page_count)]
+
+    # Identical requests under other score IDs share the rendered PDF
+    for duplicate_id in duplicate_ids:
+        duplicate_pdf = output_dir / f"nota-score-{duplicate_id}.pdf"
+        duplicate_tex = output_dir / f"nota-score-{duplicate_id}.tex"
+        # already linked to this render and its include written since, nothing to do
+        if (duplicate_pdf.exists() and os.path.samefile(output_pdf, duplicate_pdf)
+                and key_file.is_file() and duplicate_tex.is_file()
+                and duplicate_tex.stat().st_mtime >= key_file.stat().st_mtime):
+            continue
+        # the linked PDF is not this ID's own render, drop its cache records so a
+        # later build with a different request for this ID renders it again
+        for cache_file in (duplicate_pdf.with_suffix(".pdf.key"), duplicate_pdf.with_suffix(".aux.line")):
+            if cache_file.exists():
+                cache_file.unlink()
+        link_pdf(output_pdf, duplicate_pdf)
+        tex_jobs.append((duplicate_id, score_type, page_count))
+
+    return score_id, tex_jobs
+
+def process_request_safe(request: str, fields: tuple, duplicate_ids: list, **kwargs):
+    """Runs process_request in a worker, returning ("ok", request, result) or ("err", request, exception)
+    so that one failing request does not abort the rest of the build."""
+    try:
+        return ("ok", request, process_request(request, fields, duplicate_ids, **kwargs))
+    except Exception as exc:
+        return ("err", request, exc)
+
+def process_request_batch(batch: list, **kwargs) -> list:
+    """Runs process_request_safe for every (request, fields, duplicate_ids) in batch, in one worker round trip."""
+    return [process_request_safe(*item, **kwargs) for item in batch]
 
 def main():
     # argument handling
@@ -255,29 +408,110 @@ def main():
     with open(aux_file_path, 'r') as f:
         score_requests = f.readlines()
 
-    # Use ProcessPoolExecutor to process score requests in parallel.
-    # Each score request is submitted to the pool of worker processes.
-    # We keep a mapping from each Future object to its corresponding request string,
-    # so that when a Future completes, we know which request it corresponds to.
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        future_to_request = {executor.submit(process_request, request, project_root, output_dir): request for request in score_requests}
-        
-        # Iterate over futures as they complete.
-        for future in concurrent.futures.as_completed(future_to_request):
-            # Retrieve the original request string for this future.
-            request = future_to_request[future]
-            try:
-                # future.result() returns the value returned by process_request.
-                # This will be the score_id if processing was successful,
-                # or None if the request was skipped or failed.
-                result = future.result()
-                if result is not None:
-                    print(f"Finished processing score {result}")
+    # Validate and parse all requests and stat their input files once, up front,
+    # so that missing files are reported together before any work is dispatched.
+    # Workers get the parsed fields and never parse a request line again.
+    scores = []
+    request_fields = {}
+    missing_files = []
+    for request in score_requests:
+        request = request.strip()
+        if not request:
+            continue
+        match = _LINE_RE.match(request)
+        if match is None:
+            print(f"  -> Warning: Malformed line in .scores.aux, skipping: {request}")
+            continue
+        input_file = project_root / match.group(3)
+        try:
+            st = os.stat(input_file)
+        except OSError:
+            missing_files.append(input_file)
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            missing_files.append(input_file)
+            continue
+        scores.append((input_file.suffix == '.mscz', st.st_size, input_file, request))
+        request_fields[request] = parse_request(match)
+
+    if missing_files:
+        print(f"--- Error: {len(missing_files)} score file(s) not found or not a file, skipping:")
+        for input_file in missing_files:
+            print(f"  -> {input_file}")
+
+    # Slowest work first (MuseScore inputs, then larger files) for a shorter overall build
+    scores.sort(key=lambda score: (not score[0], -score[1]))
+    score_requests = [request for _, _, _, request in scores]
+
+    # Convert every .mscz input to .mxl in one MuseScore run, paying its startup cost once.
+    mscz_files = list(dict.fromkeys(input_file for is_mscz, _, input_file, _ in scores if is_mscz))
+    converted = convert_mscz_files(mscz_files, output_dir)
+
+    # The same score can be requested several times with identical settings
+    # (everything after the score ID), render each distinct request only once.
+    duplicate_ids = {}
+    unique_requests = []
+    for request in score_requests:
+        score_id, settings = request.split('|', 1)
+        if settings in duplicate_ids:
+            duplicate_ids[settings].append(score_id)
+        else:
+            duplicate_ids[settings] = []
+            unique_requests.append(request)
+
+    # Use ProcessPoolExecutor to process score requests in parallel, one worker
+    # per core, each loading its Verovio toolkit once in _init_worker.
+    # Requests are sent to the workers in batches, which saves a round trip per
+    # request when there are many small scores. The heaviest requests (.mscz
+    # inputs, then the largest files, one per worker) are sent on their own so
+    # the longest-first order spreads them over all workers instead of queueing
+    # them behind each other in one batch.
+    workers = os.cpu_count() or 1
+    items = [(request, request_fields[request], duplicate_ids[request.split('|', 1)[1]]) for request in unique_requests]
+    heavy = sum(1 for _, fields, _ in items if Path(fields[2]).suffix == '.mscz') + workers
+    chunksize = max(1, (len(items) - heavy) // (4 * workers))
+    batches = [[item] for item in items[:heavy]] + [items[i:i + chunksize] for i in range(heavy, len(items), chunksize)]
+    process = functools.partial(process_request_batch, project_root=project_root, output_dir=output_dir, converted=converted)
+
+    # .tex include files are written here in ascending score ID order, each one as
+    # soon as all lower IDs are done, so they appear in document order for LaTeX.
+    pending_ids = sorted({int(request.split('|', 1)[0]) for request in score_requests}, reverse=True)
+    finished = {}
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # handled as each batch completes, so a finished early score does not
+        # wait for slower batches submitted before it
+        futures = [executor.submit(process, batch) for batch in batches]
+        for future in concurrent.futures.as_completed(futures):
+            for status, request, result in future.result():
+                # result is (score_id, tex_jobs) if processing was successful, None if the
+                # request was skipped or failed, or the exception raised while processing.
+                score_id, settings = request.split('|', 1)
+                for done_id in [score_id] + duplicate_ids[settings]:
+                    finished[int(done_id)] = None
+
+                if status == "err":
+                    print(f"Request generated an exception: {result}")
+                elif result is not None:
+                    print(f"Finished processing score {result[0]}")
+                    for tex_id, score_type, page_count in result[1]:
+                        finished[int(tex_id)] = (score_type, page_count)
                 else:
                     print(f"Skipped or failed processing a request.")
-            except Exception as exc:
-                # If an exception was raised during processing, handle it here.
-                print(f"Request generated an exception: {exc}")
+
+                # flush the contiguous run of finished scores following the last written ID
+                while pending_ids and pending_ids[-1] in finished:
+                    tex_id = pending_ids.pop()
+                    tex_job = finished.pop(tex_id)
+                    if tex_job is not None:
+                        output_tex = output_dir / f"nota-score-{tex_id}.tex"
+                        try:
+                            write_tex(output_tex, output_dir / f"nota-score-{tex_id}.pdf", *tex_job)
+                        except OSError as e:
+                            # one unwritable include must not stop the remaining ones
+                            print(f"  -> Error writing {output_tex.name}: {e}")
+                            continue
+                        print(f"  -> Created {output_tex.name}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file